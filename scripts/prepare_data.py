@@ -7,12 +7,25 @@ Prepare GeoJSON data for web visualization.
 """
 
 import json
+import multiprocessing
+import os
 import re
 import sqlite3
+import struct
+import sys
 import unicodedata
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib json encoder
+    orjson = None
+
 # Paths
 DATA_DIR = Path(__file__).parent.parent / "data"
 OUTPUT_DIR = DATA_DIR / "web"
@@ -26,66 +39,143 @@ OUTPUT_DIR.mkdir(exist_ok=True)
 # Simplification tolerance (in degrees, ~0.005 ≈ 500m)
 SIMPLIFY_TOLERANCE = 0.005
 
+# Decimal places kept in output coordinates (~1 m, well below SIMPLIFY_TOLERANCE)
+COORDINATE_PRECISION = 5
+
+# Rows fetched per cursor.fetchmany() call when streaming GeoPackage tables
+FETCH_SIZE = 1024
+
+# GeoPackage binary header envelope size (bytes) by envelope type (flags bits 1-3)
+GPKG_ENVELOPE_SIZES = (0, 32, 48, 48, 64, 0, 0, 0)
+# GeoPackage binary header prefix: magic, version, flags
+GPKG_HEADER = struct.Struct('<2sBB')
+
+# WKB geometry type codes of the point layers -> (GeoJSON type, coordinate dimensions)
+WKB_POINT_TYPES = {1: ('Point', 2), 1001: ('Point', 3)}
+WKB_MULTIPOINT_TYPES = {4: 'MultiPoint', 1004: 'MultiPoint'}
+
+# Cap on vertices per polygon ring after simplification, to bound the size of
+# a single feature in the web viewer (exceeded only by the few vertices needed
+# to keep a capped ring from crossing itself or a neighbouring part)
+MAX_RING_VERTICES = 512
+
+# Shapely geometry type ids (shapely.get_type_id) of the layers we simplify
+POLYGON_TYPE_ID = 3
+MULTIPOLYGON_TYPE_ID = 6
+
+# Accented letters -> ASCII, used by normalize_name
+NAME_TRANSLATION = str.maketrans(
+    'áàäâãéèëêíìïîóòöôõúùüûñçÁÀÄÂÃÉÈËÊÍÌÏÎÓÒÖÔÕÚÙÜÛÑÇ',
+    'aaaaaeeeeiiiiooooouuuuncAAAAAEEEEIIIIOOOOOUUUUNC'
+)
 
+# Token rules used by tokenize_normalized
+TOKEN_STOPWORDS = frozenset({
+    'de', 'del', 'la', 'las', 'el', 'los', 'y',
+    'general', 'coronel', 'mayor', 'presidente'
+})
+TOKEN_REPLACEMENTS = {
+    'pte': 'presidente',
+    'presidencia': 'presidente',
+    'gonzales': 'gonzalez',
+    'gral': 'general'
+}
+TOKEN_NUMBERS = {
+    'tres': '3',
+    'nueve': '9',
+    'veinticinco': '25'
+}
+
+# Regex patterns used on every row, compiled once
+WHITESPACE_RE = re.compile(r'\s+')
+ANT_ARG_RE = re.compile(r'\bant\s*arg\b')
+ATL_SUR_RE = re.compile(r'\batl\s*sur\b')
+PROVINCIA_RE = re.compile(r'(?:Provincia de |^)([^<\n]+)')
+# Administrative prefixes, stripped in sequence (each at most once)
+NAME_PREFIX_RE = re.compile(
+    r'^(?:provincia de )?(?:partido de )?(?:departamento de )?(?:departamento )?'
+)
+
+
+@lru_cache(maxsize=4096)
 def normalize_name(name: str) -> str:
     """Normalize name for matching (remove accents, lowercase, etc)."""
     if not name:
         return ""
-    # Remove accents
-    name = unicodedata.normalize('NFKD', name).encode('ASCII', 'ignore').decode('ASCII')
-    # Lowercase and strip
-    name = name.lower().strip()
-    # Remove punctuation and collapse whitespace
-    name = re.sub(r'[.,]', ' ', name)
-    name = re.sub(r'\s+', ' ', name).strip()
+    # Quick check: most IGN names are already ASCII and skip accent removal
+    if not name.isascii():
+        # Remove accents
+        name = name.translate(NAME_TRANSLATION)
+        if not name.isascii():
+            # Characters outside the table still go through full decomposition
+            name = unicodedata.normalize('NFKD', name).encode('ASCII', 'ignore').decode('ASCII')
+    # Punctuation to spaces (after NFKD, which can produce it, e.g. '…' -> '...')
+    name = name.replace('.', ' ').replace(',', ' ')
+    # Lowercase and collapse whitespace
+    name = WHITESPACE_RE.sub(' ', name.lower()).strip()
     # Remove common prefixes
-    prefixes = ['provincia de ', 'partido de ', 'departamento de ', 'departamento ']
-    for prefix in prefixes:
-        if name.startswith(prefix):
-            name = name[len(prefix):]
-    return name
+    return NAME_PREFIX_RE.sub('', name, count=1)
 
 
+@lru_cache(maxsize=4096)
 def normalize_provincia(name: str) -> str:
     """Normalize province names including common abbreviations."""
     normalized = normalize_name(name)
-    normalized = re.sub(r'\bant\s*arg\b', 'antartida', normalized)
-    normalized = re.sub(r'\batl\s*sur\b', 'atlantico sur', normalized)
+    normalized = ANT_ARG_RE.sub('antartida', normalized)
+    normalized = ATL_SUR_RE.sub('atlantico sur', normalized)
     normalized = normalized.replace('atlsur', 'atlantico sur')
     normalized = normalized.replace('islas del ', 'islas ')
     return normalized
 
 
-def tokenize_normalized(name: str) -> set:
+@lru_cache(maxsize=4096)
+def tokenize_normalized(name: str) -> frozenset:
     """Tokenize a normalized name, removing common stopwords."""
-    stopwords = {
-        'de', 'del', 'la', 'las', 'el', 'los', 'y',
-        'general', 'coronel', 'mayor', 'presidente'
-    }
-    replacements = {
-        'pte': 'presidente',
-        'presidencia': 'presidente',
-        'gonzales': 'gonzalez',
-        'gral': 'general'
-    }
-    number_map = {
-        'tres': '3',
-        'nueve': '9',
-        'veinticinco': '25'
-    }
     tokens = set()
     for token in name.split():
-        token = replacements.get(token, token)
-        token = number_map.get(token, token)
+        token = TOKEN_REPLACEMENTS.get(token, token)
+        token = TOKEN_NUMBERS.get(token, token)
         if len(token) == 1 and not token.isdigit():
             continue
-        if token in stopwords:
+        if token in TOKEN_STOPWORDS:
             continue
         tokens.add(token)
         if token.startswith('la') and len(token) > 2:
             tokens.add(token[2:])
-    return tokens
+    return frozenset(tokens)
+
+
+# Description field labels (lowercased) -> property names
+DESCRIPTION_KEY_MAP = {
+    'pais': 'pais',
+    'provincia': 'provincia',
+    'povincia': 'provincia',
+    'total hectáreas': 'total_ha',
+    'total hectareas': 'total_ha',
+    'hectáreas extranjerizadas': 'extranjerizada_ha',
+    'hectareas extranjerizadas': 'extranjerizada_ha',
+    'porcentaje extranjerización': 'porcentaje',
+    'porcentaje extranjerizacion': 'porcentaje',
+}
+
+# Description values repeated across many rows, shared as interned strings
+INTERNED_DESCRIPTION_KEYS = frozenset({'pais', 'provincia'})
 
+# Foreignization levels (get_nivel); every feature references these same objects
+NIVEL_ALTO = 'alto'
+NIVEL_SOBRE_PROMEDIO = 'sobre_promedio'
+NIVEL_NORMAL = 'normal'
+NIVEL_SIN_DATOS = 'sin_datos'
+
+# INDEC departamento codes are PPDDD: province code * 1000 + departamento number
+DEPARTAMENTO_CODE_STRIDE = 1000
+
+# Tierras.gpkg layers holding one point per departamento, by level
+TIERRAS_DEPARTAMENTO_LAYERS = [
+    "Departamentos con alto nivel de extranjerización de tierras",
+    "Departamentos por encima del promedio nacional",
+    "Departamentos dentro del promedio nacional"
+]
 
 CAPITAL_NAME_BY_PROV = {
     'misiones': 'posadas',
@@ -98,34 +188,53 @@ CAPITAL_NAME_BY_PROV = {
 }
 
 
+def iter_br_fragments(description: str):
+    """Yield the fragments of `description` between <br>, <br/> or <br /> tags.
+
+    Single scan with str.find; tags are matched case-insensitively. When every
+    tag is a plain lowercase <br> (as in all Tierras layers) this is a str.split.
+    """
+    if description.count('<') == description.count('<br>'):
+        yield from description.split('<br>')
+        return
+    length = len(description)
+    start = search = 0
+    while True:
+        tag = description.find('<', search)
+        if tag < 0:
+            yield description[start:]
+            return
+        pos = tag + 3
+        if description[tag + 1:pos].lower() != 'br':
+            search = tag + 1
+            continue
+        while pos < length and description[pos].isspace():
+            pos += 1
+        if pos < length and description[pos] == '/':
+            pos += 1
+        if pos >= length or description[pos] != '>':
+            search = tag + 1
+            continue
+        yield description[start:tag]
+        start = search = pos + 1
+
+
 def parse_html_description(description: str) -> dict:
     """Parse HTML description field to extract structured data."""
     if not description:
         return {}
     
     data = {}
-    parts = re.split(r'<br\s*/?>', description, flags=re.IGNORECASE)
     
-    for part in parts:
-        part = part.strip()
-        if ':' in part:
-            key, value = part.split(':', 1)
-            key = key.strip().lower()
-            value = value.strip()
+    for part in iter_br_fragments(description):
+        colon = part.find(':')
+        if colon >= 0:
+            key = part[:colon].strip().lower()
+            value = part[colon + 1:].strip()
             
-            key_map = {
-                'pais': 'pais',
-                'provincia': 'provincia',
-                'povincia': 'provincia',
-                'total hectáreas': 'total_ha',
-                'total hectareas': 'total_ha',
-                'hectáreas extranjerizadas': 'extranjerizada_ha',
-                'hectareas extranjerizadas': 'extranjerizada_ha',
-                'porcentaje extranjerización': 'porcentaje',
-                'porcentaje extranjerizacion': 'porcentaje',
-            }
-            
-            normalized_key = key_map.get(key, key.replace(' ', '_'))
+            normalized_key = DESCRIPTION_KEY_MAP.get(key)
+            if normalized_key is None:
+                normalized_key = key.replace(' ', '_')
             
             if normalized_key in ('total_ha', 'extranjerizada_ha'):
                 value = value.replace(',', '')
@@ -141,6 +250,8 @@ def parse_html_description(description: str) -> dict:
                         value = float(value)
                     except ValueError:
                         pass
+            elif normalized_key in INTERNED_DESCRIPTION_KEYS:
+                value = sys.intern(value)
             
             data[normalized_key] = value
     
@@ -150,42 +261,426 @@ def parse_html_description(description: str) -> dict:
 def get_nivel(porcentaje) -> str:
     """Categorize by foreignization level."""
     if porcentaje is None:
-        return "sin_datos"
+        return NIVEL_SIN_DATOS
     if porcentaje >= 10:
-        return "alto"
+        return NIVEL_ALTO
     elif porcentaje >= 6:
-        return "sobre_promedio"
+        return NIVEL_SOBRE_PROMEDIO
     else:
-        return "normal"
+        return NIVEL_NORMAL
+
+
+def strip_gpkg_headers(blobs: list) -> list:
+    """Strip the GeoPackage binary headers of a batch of blobs.
+
+    Magic, version and flags are read with one precompiled ``struct`` call
+    per blob, and the envelope size is a table lookup on the flags.
+    """
+    wkbs = []
+    for blob in blobs:
+        start = 0
+        if len(blob) >= GPKG_HEADER.size:
+            magic, _version, flags = GPKG_HEADER.unpack_from(blob)
+            if magic == b'GP':
+                start = 8 + GPKG_ENVELOPE_SIZES[(flags >> 1) & 7]
+        wkbs.append(blob[start:])
+    return wkbs
+
+
+def farthest_from_segment(coords, start: int, end: int) -> tuple:
+    """Return the index of the vertex strictly between `start` and `end` that
+    is farthest from the segment joining them, and its distance."""
+    import numpy as np
+
+    a, b = coords[start], coords[end]
+    points = coords[start + 1:end]
+    ab = b - a
+    length_sq = ab @ ab
+    if length_sq == 0:
+        distances = np.hypot(*(points - a).T)
+    else:
+        t = np.clip((points - a) @ ab / length_sq, 0, 1)
+        distances = np.hypot(*(points - (a + t[:, None] * ab)).T)
+    best = int(np.argmax(distances))
+    return start + 1 + best, distances[best]
+
+
+def cap_ring_vertices(coords, max_vertices: int = MAX_RING_VERTICES):
+    """Select at most `max_vertices` vertices of a closed ring.
+
+    Douglas-Peucker driven by a priority queue: starting from the first vertex
+    and the one farthest from it, the vertex with the largest distance to its
+    current segment is added next, until the vertex budget is spent.
+    Returns a boolean mask over `coords` (all set if the ring fits already).
+    """
+    import heapq
+    import numpy as np
+
+    count = len(coords)
+    if count <= max_vertices:
+        return np.ones(count, dtype=bool)
+
+    def push(heap, start, end):
+        if end - start < 2:
+            return
+        index, distance = farthest_from_segment(coords, start, end)
+        heapq.heappush(heap, (-distance, index, start, end))
+
+    keep = np.zeros(count, dtype=bool)
+    farthest = 1 + int(np.argmax(np.hypot(*(coords[1:-1] - coords[0]).T)))
+    keep[[0, farthest, count - 1]] = True
+    heap = []
+    push(heap, 0, farthest)
+    push(heap, farthest, count - 1)
+    for _ in range(max_vertices - 3):
+        if not heap:
+            break
+        _, index, start, end = heapq.heappop(heap)
+        keep[index] = True
+        push(heap, start, index)
+        push(heap, index, end)
+    return keep
+
+
+def split_ring_segments(coords, keep, segments) -> int:
+    """Give kept segments of a capped ring back their Douglas-Peucker split vertex.
+
+    `segments` are positions in the sequence of kept segments; the vertex of
+    the original ring farthest from each one is set in the `keep` mask, in
+    place. Returns the number of vertices added.
+    """
+    import numpy as np
+
+    kept = np.flatnonzero(keep)
+    added = 0
+    for i in segments:
+        start, end = kept[i], kept[i + 1]
+        if end - start >= 2:
+            keep[farthest_from_segment(coords, start, end)[0]] = True
+            added += 1
+    return added
+
+
+def refine_ring_around(coords, keep, obstacles: list) -> int:
+    """Refine a capped ring where it cuts off or across `obstacles` polygons.
+
+    A kept segment is split when the pocket between it and the original
+    vertices it skips (as a polygon) overlaps one of the `obstacles`.
+    Returns the number of vertices added.
+    """
+    import numpy as np
+    import shapely
+
+    kept = np.flatnonzero(keep)
+    spans = np.flatnonzero(np.diff(kept) >= 2)
+    pockets = np.array([shapely.Polygon(coords[kept[i]:kept[i + 1] + 1]) for i in spans], dtype=object)
+    overlapping = np.zeros(len(spans), dtype=bool)
+    for obstacle in obstacles:
+        overlapping |= shapely.relate_pattern(pockets, obstacle, 'T********')
+    return split_ring_segments(coords, keep, spans[overlapping])
+
 
+def refine_self_crossings(rings: list, masks: list) -> int:
+    """Refine the capped rings of a polygon where their segments cross each other.
 
-def gpkg_to_geojson_geometry(wkb_bytes, simplify_tolerance: float = SIMPLIFY_TOLERANCE):
-    """Convert GeoPackage geometry to GeoJSON geometry with simplification."""
+    Both segments of every intersecting, non-adjacent pair are split.
+    Returns the number of vertices added.
+    """
+    import numpy as np
+    import shapely
+
+    lines = []
+    owners = []
+    for k, (ring, mask) in enumerate(zip(rings, masks)):
+        kept = ring[mask]
+        lines.extend(shapely.linestrings(np.stack([kept[:-1], kept[1:]], axis=1)))
+        owners.extend((k, i, len(kept) - 1) for i in range(len(kept) - 1))
+    left, right = shapely.STRtree(lines).query(lines, predicate='intersects')
+    crossing = defaultdict(set)
+    for a, b in zip(left.tolist(), right.tolist()):
+        (ring_a, i, count), (ring_b, j, _) = owners[a], owners[b]
+        if a >= b or (ring_a == ring_b and (j - i == 1 or (i == 0 and j == count - 1))):
+            continue
+        crossing[ring_a].add(i)
+        crossing[ring_b].add(j)
+    return sum(
+        split_ring_segments(rings[k], masks[k], sorted(segments))
+        for k, segments in crossing.items()
+    )
+
+
+def polygon_rings(part) -> list:
+    """Coordinates of the exterior and interior rings of a Polygon."""
+    import shapely
+
+    return [shapely.get_coordinates(part.exterior)] + [
+        shapely.get_coordinates(hole) for hole in part.interiors
+    ]
+
+
+def polygon_from_masks(rings: list, masks: list):
+    """Polygon made of the kept vertices of each ring."""
+    import shapely
+
+    return shapely.Polygon(rings[0][masks[0]], [ring[mask] for ring, mask in zip(rings[1:], masks[1:])])
+
+
+def refine_polygon(rings: list, masks: list):
+    """Polygon of the kept ring vertices, refined with ``refine_self_crossings``
+    until it is valid. Returns None if the refinement stalls first."""
+    while True:
+        polygon = polygon_from_masks(rings, masks)
+        if polygon.is_valid:
+            return polygon
+        if not refine_self_crossings(rings, masks):
+            return None
+
+
+def cap_polygon_part(part, budget: int) -> tuple:
+    """Cap every ring of a Polygon to `budget` vertices.
+
+    Where the capped rings cross themselves or each other, the crossing
+    segments are refined (``refine_polygon``); if that stalls, the budget is
+    doubled, until the result is valid.
+    Returns the polygon, the budget used and the kept-vertex masks of its
+    rings (None when no ring had to be reduced).
+    """
+    rings = polygon_rings(part)
+    while True:
+        masks = [cap_ring_vertices(ring, budget) for ring in rings]
+        if all(mask.all() for mask in masks):
+            return part, budget, None
+        polygon = refine_polygon(rings, masks)
+        if polygon is not None:
+            return polygon, budget, masks
+        budget *= 2
+
+
+def cap_polygon_vertices(geom, max_vertices: int = MAX_RING_VERTICES):
+    """Cap every ring of a (Multi)Polygon to about `max_vertices` vertices.
+
+    Parts are capped with ``cap_polygon_part``. A capped part that ends up
+    overlapping another part (typically a coastline cutting off a nearby
+    island) is refined with ``refine_ring_around`` where it does; if that
+    stalls or is invalid, it is retried with a doubled budget, until it no
+    longer clashes or is back to its original rings. The whole geometry is
+    returned unchanged if the result is still invalid.
+    """
+    import numpy as np
+    import shapely
+
+    parts = shapely.get_parts(geom)
+    capped = [cap_polygon_part(part, max_vertices) for part in parts]
+    polygons = [polygon for polygon, _, _ in capped]
+
+    if geom.geom_type != 'MultiPolygon':
+        return polygons[0] if polygons[0].is_valid else geom
+
+    while True:
+        result = shapely.MultiPolygon(polygons)
+        if result.is_valid:
+            return result
+        # Pairs of parts whose interiors overlap, or whose boundaries share a
+        # line (touching at points is still valid)
+        left, right = shapely.STRtree(polygons).query(polygons, predicate='intersects')
+        pairs = left < right
+        left, right = left[pairs], right[pairs]
+        matrices = shapely.relate(np.take(polygons, left), np.take(polygons, right))
+        clashes = np.array([m[0] != 'F' or m[4] == '1' for m in matrices], dtype=bool)
+        neighbours = defaultdict(list)
+        for i, j in zip(left[clashes].tolist(), right[clashes].tolist()):
+            neighbours[i].append(j)
+            neighbours[j].append(i)
+        retry = [i for i in sorted(neighbours) if capped[i][2] is not None]
+        if not retry:
+            return geom
+        for i in retry:
+            _, budget, masks = capped[i]
+            rings = polygon_rings(parts[i])
+            obstacles = [polygons[j] for j in neighbours[i]]
+            refined = None
+            if sum(refine_ring_around(ring, mask, obstacles) for ring, mask in zip(rings, masks)):
+                refined = refine_polygon(rings, masks)
+            if refined is not None:
+                capped[i] = (refined, budget, masks)
+            else:
+                capped[i] = cap_polygon_part(parts[i], budget * 2)
+            polygons[i] = capped[i][0]
+
+
+def gpkg_to_geojson_geometries(blobs: list, simplify_tolerance: float = SIMPLIFY_TOLERANCE) -> list:
+    """Convert a batch of GeoPackage geometries to GeoJSON geometries with simplification.
+
+    All blobs are decoded with a single vectorized ``shapely.from_wkb`` call
+    and simplified with a single ``shapely.simplify`` call, then rings are capped to ``MAX_RING_VERTICES`` vertices. Coordinates are
+    rounded to ``COORDINATE_PRECISION`` decimals.
+    Geometries that fail to parse are returned as None.
+    """
+    import numpy as np
+    import shapely
+    import shapely.geometry
+
+    wkb_list = np.asarray(strip_gpkg_headers(blobs), dtype=object)
+    geoms = shapely.from_wkb(wkb_list, on_invalid='ignore')
+
+    if simplify_tolerance > 0:
+        types = shapely.get_type_id(geoms)
+        is_polygon = np.isin(types, (POLYGON_TYPE_ID, MULTIPOLYGON_TYPE_ID))
+
+        # Simplify the (Multi)Polygons in one GEOS loop over the array
+        # (shapely.simplify only dispatches once to the simplify_preserve_topology
+        # ufunc, so calling shapely.lib directly would not save per-geometry work)
+        simplified = shapely.simplify(
+            np.where(is_polygon, geoms, None), simplify_tolerance, preserve_topology=True
+        )
+        geoms = np.where(is_polygon, simplified, geoms)
+
+        # Bound ring sizes; only geometries with enough vertices can exceed the cap
+        is_capped = np.isin(types, (POLYGON_TYPE_ID, MULTIPOLYGON_TYPE_ID)) & (
+            shapely.get_num_coordinates(geoms) > MAX_RING_VERTICES
+        )
+        for i in np.flatnonzero(is_capped):
+            geoms[i] = cap_polygon_vertices(geoms[i])
+
+    # Quantize coordinates: shorter JSON numbers, smaller files, faster encoding.
+    # transform() writes back XY only unless include_z=True (shapely 2.0 has no
+    # include_z=None) and always drops M, so geometries with M are left as is.
+    def round_coords(coords):
+        return np.round(coords, COORDINATE_PRECISION)
+
+    has_m = shapely.has_m(geoms) if hasattr(shapely, 'has_m') else np.zeros(len(geoms), dtype=bool)
+    has_z = shapely.has_z(geoms) & ~has_m
+    is_xy = ~has_z & ~has_m & ~shapely.is_missing(geoms)
+    geoms = geoms.copy()
+    geoms[is_xy] = shapely.transform(geoms[is_xy], round_coords)
+    geoms[has_z] = shapely.transform(geoms[has_z], round_coords, include_z=True)
+
+    geometries = []
+    for geom in geoms:
+        if geom is None:
+            print("⚠ Error parsing geometry: invalid WKB")
+            geometries.append(None)
+            continue
+        geometries.append(shapely.geometry.mapping(geom))
+    return geometries
+
+
+def connect_gpkg(path: Path) -> sqlite3.Connection:
+    """Open a GeoPackage read-only, tuned for full-table scans of geometry blobs."""
+    conn = sqlite3.connect(f'{path.resolve().as_uri()}?mode=ro&immutable=1', uri=True)
+    conn.execute('PRAGMA mmap_size=1073741824')  # map up to 1 GB instead of read() calls
+    conn.execute('PRAGMA cache_size=-262144')  # 256 MB page cache
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA query_only=1')
+    return conn
+
+
+@dataclass(slots=True)
+class ProvinciaProperties:
+    nombre: str
+    nombre_completo: str
+    total_ha: float | None
+    extranjerizada_ha: float | None
+    porcentaje: float | None
+    nivel: str
+
+
+@dataclass(slots=True)
+class DepartamentoProperties:
+    nombre: str
+    nombre_completo: str
+    codigo: str
+    provincia: str | None
+    total_ha: float | None
+    extranjerizada_ha: float | None
+    porcentaje: float | None
+    nivel: str
+
+
+@dataclass(slots=True)
+class PuntoProperties:
+    nombre: str
+    provincia: str | None
+    total_ha: float | None
+    extranjerizada_ha: float | None
+    porcentaje: float | None
+    nivel: str
+
+
+@dataclass(slots=True)
+class Feature:
+    """GeoJSON Feature; serialized by orjson (or ``asdict``) in field order."""
+    type: str = field(default="Feature", init=False)
+    id: int
+    properties: ProvinciaProperties | DepartamentoProperties | PuntoProperties
+    geometry: dict
+
+
+def fetch_chunks(cursor: sqlite3.Cursor, size: int = FETCH_SIZE):
+    """Yield the rows of an executed query in chunks of `size` rows."""
+    cursor.arraysize = size
+    while True:
+        rows = cursor.fetchmany()
+        if not rows:
+            break
+        yield rows
+
+
+def tierras_layers_query(columns: str, where: str = None) -> str:
+    """Build a single UNION ALL query over the Tierras departamento layers."""
+    condition = f' WHERE {where}' if where else ''
+    return ' UNION ALL '.join(
+        f'SELECT {columns} FROM "{layer}"{condition}' for layer in TIERRAS_DEPARTAMENTO_LAYERS
+    )
+
+
+def decode_point_wkb(wkb: bytes, offset: int = 0):
+    """Decode a (Multi)Point WKB straight into a GeoJSON geometry, without shapely.
+
+    Only XY and XYZ points are handled; returns None for anything else
+    (including empty points and truncated blobs), so callers can fall back
+    to shapely, which reports and skips malformed rows.
+    """
     try:
-        import shapely.wkb
-        import shapely.geometry
-        
-        if wkb_bytes[:2] == b'GP':
-            flags = wkb_bytes[3]
-            envelope_type = (flags & 0x0E) >> 1
-            envelope_sizes = {0: 0, 1: 32, 2: 48, 3: 48, 4: 64}
-            envelope_size = envelope_sizes.get(envelope_type, 0)
-            wkb_start = 8 + envelope_size
-            wkb_data = wkb_bytes[wkb_start:]
-        else:
-            wkb_data = wkb_bytes
-        
-        geom = shapely.wkb.loads(wkb_data)
-        
-        if simplify_tolerance > 0 and geom.geom_type in ('Polygon', 'MultiPolygon'):
-            geom = geom.simplify(simplify_tolerance, preserve_topology=True)
-        
-        return shapely.geometry.mapping(geom)
-    except Exception as e:
-        print(f"⚠ Error parsing geometry: {e}")
+        byte_order = '<' if wkb[offset] else '>'
+        (wkb_type,) = struct.unpack_from(byte_order + 'I', wkb, offset + 1)
+        if wkb_type in WKB_POINT_TYPES:
+            geom_type, dims = WKB_POINT_TYPES[wkb_type]
+            coords = struct.unpack_from(f'{byte_order}{dims}d', wkb, offset + 5)
+            if any(c != c for c in coords):  # NaN coordinates encode an empty point
+                return None
+            return {"type": geom_type, "coordinates": tuple(round(c, COORDINATE_PRECISION) for c in coords)}
+        if wkb_type in WKB_MULTIPOINT_TYPES:
+            (count,) = struct.unpack_from(byte_order + 'I', wkb, offset + 5)
+            offset += 9
+            points = []
+            for _ in range(count):
+                point = decode_point_wkb(wkb, offset)
+                if point is None or point["type"] != "Point":
+                    return None
+                points.append(point["coordinates"])
+                offset += 5 + 8 * len(point["coordinates"])
+            return {"type": WKB_MULTIPOINT_TYPES[wkb_type], "coordinates": points}
+        return None
+    except (IndexError, struct.error):
         return None
 
 
+def gpkg_points_to_geojson_geometries(blobs: list) -> list:
+    """Convert a batch of GeoPackage point geometries to GeoJSON geometries.
+
+    (Multi)Points are decoded directly with struct; other geometries go
+    through ``gpkg_to_geojson_geometries`` without simplification.
+    """
+    geometries = [decode_point_wkb(wkb) for wkb in strip_gpkg_headers(blobs)]
+    fallback = [i for i, geometry in enumerate(geometries) if geometry is None]
+    if fallback:
+        decoded = gpkg_to_geojson_geometries([blobs[i] for i in fallback], simplify_tolerance=0)
+        for i, geometry in zip(fallback, decoded):
+            geometries[i] = geometry
+    return geometries
+
+
 def load_tierras_data(conn: sqlite3.Connection) -> dict:
     """Load all data from Tierras.gpkg and build lookup dictionaries."""
     cursor = conn.cursor()
@@ -193,7 +688,7 @@ def load_tierras_data(conn: sqlite3.Connection) -> dict:
     # Load provincias
     provincias_data = {}
     cursor.execute('SELECT Name, Description FROM "Provincias.xlsx"')
-    for name, description in cursor.fetchall():
+    for name, description in cursor:
         if name == 'GP':
             # Name is in description
             data = parse_html_description(description)
@@ -205,13 +700,13 @@ def load_tierras_data(conn: sqlite3.Connection) -> dict:
                     break
             if not prov_name:
                 # Try to find it in the original description
-                match = re.search(r'(?:Provincia de |^)([^<\n]+)', description)
+                match = PROVINCIA_RE.search(description)
                 if match:
                     prov_name = match.group(1).strip()
         else:
             prov_name = name
             data = parse_html_description(description)
-        
+    
         if prov_name:
             normalized = normalize_provincia(prov_name)
             data['nombre_original'] = prov_name
@@ -222,231 +717,257 @@ def load_tierras_data(conn: sqlite3.Connection) -> dict:
     departamentos_data = {}
     departamentos_by_name = defaultdict(list)
     departamentos_by_prov = defaultdict(list)
-    layers = [
-        "Departamentos con alto nivel de extranjerización de tierras",
-        "Departamentos por encima del promedio nacional",
-        "Departamentos dentro del promedio nacional"
-    ]
+    departamentos_token_index = defaultdict(lambda: defaultdict(list))
     
-    for layer in layers:
-        cursor.execute(f'SELECT Name, Description FROM "{layer}"')
-        for name, description in cursor.fetchall():
-            data = parse_html_description(description)
-            data['nombre_original'] = name
-            data['nivel'] = get_nivel(data.get('porcentaje'))
-            
-            provincia = data.get('provincia')
-            normalized_name = normalize_name(name)
-            normalized_prov = normalize_provincia(provincia)
+    cursor.execute(tierras_layers_query('Name, Description'))
+    for name, description in cursor:
+        data = parse_html_description(description)
+        data['nombre_original'] = name
+        data['nivel'] = get_nivel(data.get('porcentaje'))
 
-            if normalized_prov:
-                key = f"{normalized_prov}|{normalized_name}"
-                departamentos_data[key] = data
+        provincia = data.get('provincia')
+        normalized_name = normalize_name(name)
+        normalized_prov = normalize_provincia(provincia)
 
-            departamentos_by_name[normalized_name].append(data)
-            if normalized_prov:
-                departamentos_by_prov[normalized_prov].append({
-                    'tokens': tokenize_normalized(normalized_name),
-                    'data': data
-                })
+        if normalized_prov:
+            key = f"{normalized_prov}|{normalized_name}"
+            departamentos_data[key] = data
+
+        departamentos_by_name[normalized_name].append(data)
+        if normalized_prov:
+            tokens = tokenize_normalized(normalized_name)
+            items = departamentos_by_prov[normalized_prov]
+            token_index = departamentos_token_index[normalized_prov]
+            # Names without tokens are kept under '' (tokens are never empty strings)
+            for token in tokens or ('',):
+                token_index[token].append(len(items))
+            items.append((tokens, data))
     
     return {
         'provincias': provincias_data,
         'departamentos': departamentos_data,
         'departamentos_by_name': dict(departamentos_by_name),
-        'departamentos_by_prov': dict(departamentos_by_prov)
+        'departamentos_by_prov': dict(departamentos_by_prov),
+        'departamentos_token_index': {
+            prov: dict(token_index) for prov, token_index in departamentos_token_index.items()
+        }
     }
 
 
 def build_province_code_map(conn: sqlite3.Connection) -> dict:
-    """Build a province code -> name map from IGN provincias."""
+    """Build a province code (int) -> name map from IGN provincias."""
     cursor = conn.cursor()
     cursor.execute('SELECT in1, nam, fna FROM ignprovincia')
     code_map = {}
 
-    for in1, nam, fna in cursor.fetchall():
+    for in1, nam, fna in cursor:
         if in1 is None:
             continue
-        code = str(in1).zfill(2)
-        code_map[code] = nam or fna
+        code_map[int(in1)] = nam or fna
 
     return code_map
 
 
-def process_ign_provincias(conn: sqlite3.Connection, tierras_data: dict) -> dict:
-    """Process IGN provincias polygons and join with Tierras data."""
-    print("Processing IGN provincias polygons...")
+def find_token_candidates(items: list, token_index: dict, ign_tokens: frozenset) -> list:
+    """Return the data of items whose tokens are a subset or superset of `ign_tokens`.
+
+    `items` are ``(tokens, data)`` tuples. Only items sharing a token with `ign_tokens` (found through `token_index`)
+    or without tokens at all can match, so only those are checked.
+    """
+    if not ign_tokens:
+        # The empty set is a subset of every item's tokens
+        return [data for _, data in items]
+    positions = set(token_index.get('', ()))
+    for token in ign_tokens:
+        positions.update(token_index.get(token, ()))
+    candidates = []
+    for position in sorted(positions):
+        tokens, data = items[position]
+        if tokens <= ign_tokens or ign_tokens <= tokens:
+            candidates.append(data)
+    return candidates
+
+
+def process_ign_provincias(conn: sqlite3.Connection, tierras_data: dict, counts: dict):
+    """Process IGN provincias polygons and join with Tierras data, yielding features.
+
+    The number of features matched with Tierras data is stored in `counts`.
+    """
     cursor = conn.cursor()
     
-    cursor.execute('SELECT fid, geom, fna, nam FROM ignprovincia')
-    rows = cursor.fetchall()
+    cursor.execute('SELECT fid, geom, fna, nam FROM ignprovincia WHERE geom IS NOT NULL')
     
-    features = []
     matched = 0
     
-    for fid, geom_bytes, fna, nam in rows:
-        geometry = gpkg_to_geojson_geometry(geom_bytes) if geom_bytes else None
-        if not geometry:
-            continue
+    for rows in fetch_chunks(cursor):
+        geometries = gpkg_to_geojson_geometries([row[1] for row in rows])
+        for (fid, _, fna, nam), geometry in zip(rows, geometries):
+            if not geometry:
+                continue
         
-        # Try to match with Tierras data
-        normalized = normalize_provincia(nam or fna)
-        tierras = tierras_data['provincias'].get(normalized, {})
+            # Try to match with Tierras data
+            normalized = normalize_provincia(nam or fna)
+            tierras = tierras_data['provincias'].get(normalized, {})
         
-        if tierras:
-            matched += 1
+            if tierras:
+                matched += 1
         
-        props = {
-            'fid': fid,
-            'nombre': nam or fna,
-            'nombre_completo': fna,
-            'total_ha': tierras.get('total_ha'),
-            'extranjerizada_ha': tierras.get('extranjerizada_ha'),
-            'porcentaje': tierras.get('porcentaje'),
-            'nivel': tierras.get('nivel', 'sin_datos')
-        }
+            props = ProvinciaProperties(
+                nombre=nam or fna,
+                nombre_completo=fna,
+                total_ha=tierras.get('total_ha'),
+                extranjerizada_ha=tierras.get('extranjerizada_ha'),
+                porcentaje=tierras.get('porcentaje'),
+                nivel=tierras.get('nivel', NIVEL_SIN_DATOS)
+            )
         
-        features.append({
-            "type": "Feature",
-            "properties": props,
-            "geometry": geometry
-        })
+            yield Feature(id=fid, properties=props, geometry=geometry)
     
-    print(f"  Found {len(features)} provincias, matched {matched} with Tierras data")
-    
-    return {
-        "type": "FeatureCollection",
-        "features": features
-    }
+    counts['matched'] = matched
 
 
-def process_ign_departamentos(conn: sqlite3.Connection, tierras_data: dict, province_code_map: dict) -> dict:
-    """Process IGN departamentos polygons and join with Tierras data."""
-    print("Processing IGN departamentos polygons...")
+def process_ign_departamentos(conn: sqlite3.Connection, tierras_data: dict, province_code_map: dict, counts: dict):
+    """Process IGN departamentos polygons and join with Tierras data, yielding features.
+
+    The number of features matched with Tierras data is stored in `counts`.
+    """
     cursor = conn.cursor()
     
-    cursor.execute('SELECT fid, geom, fna, nam, in1 FROM igndepartamento')
-    rows = cursor.fetchall()
+    cursor.execute('SELECT fid, geom, fna, nam, in1 FROM igndepartamento WHERE geom IS NOT NULL')
     
-    features = []
     matched = 0
     
-    for fid, geom_bytes, fna, nam, in1 in rows:
-        geometry = gpkg_to_geojson_geometry(geom_bytes) if geom_bytes else None
-        if not geometry:
-            continue
+    for rows in fetch_chunks(cursor):
+        geometries = gpkg_to_geojson_geometries([row[1] for row in rows])
+        for (fid, _, fna, nam, in1), geometry in zip(rows, geometries):
+            if not geometry:
+                continue
         
-        # Try to match with Tierras data using province + departamento
-        dept_name = nam or fna
-        normalized_name = normalize_name(dept_name)
-        prov_code = str(in1)[:2] if in1 is not None else None
-        prov_name = province_code_map.get(prov_code) if prov_code else None
-        normalized_prov = normalize_provincia(prov_name)
-
-        tierras = None
-        if normalized_prov:
-            key = f"{normalized_prov}|{normalized_name}"
-            tierras = tierras_data['departamentos'].get(key)
-
-        if tierras is None and not normalized_prov:
-            matches = tierras_data.get('departamentos_by_name', {}).get(normalized_name, [])
-            if len(matches) == 1:
-                tierras = matches[0]
-
-        if tierras is None and normalized_prov:
-            ign_tokens = tokenize_normalized(normalized_name)
-            candidates = []
-            for item in tierras_data.get('departamentos_by_prov', {}).get(normalized_prov, []):
-                tokens = item.get('tokens', set())
-                if tokens <= ign_tokens or ign_tokens <= tokens:
-                    candidates.append(item.get('data'))
-            if len(candidates) == 1:
-                tierras = candidates[0]
-
-        if tierras is None and normalized_prov and normalized_name in {'capital', 'la capital'}:
-            capital_name = CAPITAL_NAME_BY_PROV.get(normalized_prov)
-            if capital_name:
-                key = f"{normalized_prov}|{capital_name}"
+            # Try to match with Tierras data using province + departamento
+            dept_name = nam or fna
+            normalized_name = normalize_name(dept_name)
+            prov_code = int(in1) // DEPARTAMENTO_CODE_STRIDE if in1 is not None else None
+            prov_name = province_code_map.get(prov_code)
+            normalized_prov = normalize_provincia(prov_name)
+
+            tierras = None
+            if normalized_prov:
+                key = f"{normalized_prov}|{normalized_name}"
                 tierras = tierras_data['departamentos'].get(key)
 
-        if tierras is not None:
-            matched += 1
+            if tierras is None and not normalized_prov:
+                matches = tierras_data.get('departamentos_by_name', {}).get(normalized_name, [])
+                if len(matches) == 1:
+                    tierras = matches[0]
+
+            if tierras is None and normalized_prov:
+                ign_tokens = tokenize_normalized(normalized_name)
+                candidates = find_token_candidates(
+                    tierras_data.get('departamentos_by_prov', {}).get(normalized_prov, []),
+                    tierras_data.get('departamentos_token_index', {}).get(normalized_prov, {}),
+                    ign_tokens
+                )
+                if len(candidates) == 1:
+                    tierras = candidates[0]
+
+            if tierras is None and normalized_prov and normalized_name in {'capital', 'la capital'}:
+                capital_name = CAPITAL_NAME_BY_PROV.get(normalized_prov)
+                if capital_name:
+                    key = f"{normalized_prov}|{capital_name}"
+                    tierras = tierras_data['departamentos'].get(key)
+
+            if tierras is not None:
+                matched += 1
         
-        props = {
-            'fid': fid,
-            'nombre': dept_name,
-            'nombre_completo': fna,
-            'codigo': in1,
-            'provincia': (tierras or {}).get('provincia') or prov_name,
-            'total_ha': (tierras or {}).get('total_ha'),
-            'extranjerizada_ha': (tierras or {}).get('extranjerizada_ha'),
-            'porcentaje': (tierras or {}).get('porcentaje'),
-            'nivel': (tierras or {}).get('nivel', 'sin_datos')
-        }
+            props = DepartamentoProperties(
+                nombre=dept_name,
+                nombre_completo=fna,
+                codigo=in1,
+                provincia=(tierras or {}).get('provincia') or prov_name,
+                total_ha=(tierras or {}).get('total_ha'),
+                extranjerizada_ha=(tierras or {}).get('extranjerizada_ha'),
+                porcentaje=(tierras or {}).get('porcentaje'),
+                nivel=(tierras or {}).get('nivel', NIVEL_SIN_DATOS)
+            )
         
-        features.append({
-            "type": "Feature",
-            "properties": props,
-            "geometry": geometry
-        })
-    
-    print(f"  Found {len(features)} departamentos, matched {matched} with Tierras data")
+            yield Feature(id=fid, properties=props, geometry=geometry)
     
-    return {
-        "type": "FeatureCollection",
-        "features": features
-    }
+    counts['matched'] = matched
 
 
-def process_tierras_points(conn: sqlite3.Connection) -> dict:
-    """Extract original point geometries from Tierras.gpkg for overlay."""
-    print("Processing Tierras points...")
+def process_tierras_points(conn: sqlite3.Connection):
+    """Extract original point geometries from Tierras.gpkg for overlay, yielding features."""
     cursor = conn.cursor()
     
-    features = []
-    
     # Load departamentos from all 3 layers
-    layers = [
-        ("Departamentos con alto nivel de extranjerización de tierras", "alto"),
-        ("Departamentos por encima del promedio nacional", "sobre_promedio"),
-        ("Departamentos dentro del promedio nacional", "normal")
-    ]
-    
-    for layer, nivel_layer in layers:
-        cursor.execute(f'SELECT fid, geom, Name, Description FROM "{layer}"')
-        for fid, geom_bytes, name, description in cursor.fetchall():
-            geometry = gpkg_to_geojson_geometry(geom_bytes, simplify_tolerance=0)
+    cursor.execute(tierras_layers_query('fid, geom, Name, Description', 'geom IS NOT NULL'))
+    for rows in fetch_chunks(cursor):
+        geometries = gpkg_points_to_geojson_geometries([row[1] for row in rows])
+        for (fid, _, name, description), geometry in zip(rows, geometries):
             if not geometry:
                 continue
-            
+        
             data = parse_html_description(description)
-            
-            props = {
-                'fid': fid,
-                'nombre': name,
-                'provincia': data.get('provincia'),
-                'total_ha': data.get('total_ha'),
-                'extranjerizada_ha': data.get('extranjerizada_ha'),
-                'porcentaje': data.get('porcentaje'),
-                'nivel': get_nivel(data.get('porcentaje'))
-            }
-            
-            features.append({
-                "type": "Feature",
-                "properties": props,
-                "geometry": geometry
-            })
-    
-    print(f"  Found {len(features)} points")
-    
-    return {
-        "type": "FeatureCollection",
-        "features": features
-    }
+        
+            props = PuntoProperties(
+                nombre=name,
+                provincia=data.get('provincia'),
+                total_ha=data.get('total_ha'),
+                extranjerizada_ha=data.get('extranjerizada_ha'),
+                porcentaje=data.get('porcentaje'),
+                nivel=get_nivel(data.get('porcentaje'))
+            )
+        
+            yield Feature(id=fid, properties=props, geometry=geometry)
+
+
+def collect_properties(features, sink: list):
+    """Pass features through, appending their properties (as dicts) to `sink`."""
+    for feature in features:
+        sink.append(asdict(feature.properties))
+        yield feature
 
 
-def generate_stats(provincias: dict, departamentos: dict, points: dict) -> dict:
-    """Generate statistics JSON for table and charts."""
+def encode_json(obj, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON (dataclasses as objects), with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2, default=asdict).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=asdict).encode('utf-8')
+
+
+def write_featurecollection(path: Path, features) -> int:
+    """Stream features to a GeoJSON FeatureCollection file, one at a time.
+
+    Features are written to a temporary file next to `path`, which replaces
+    `path` only once the collection is complete; if processing fails midway
+    the previous output is left untouched.
+    Returns the number of features written.
+    """
+    count = 0
+    tmp_path = path.with_name(f'.{path.name}.tmp')
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(b'{"type":"FeatureCollection","features":[')
+            for feature in features:
+                if count:
+                    f.write(b',')
+                f.write(encode_json(feature))
+                count += 1
+            f.write(b']}')
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_path, path)
+    return count
+
+
+def generate_stats(provincias: list, total_departamentos_ign: int, points: list) -> dict:
+    """Generate statistics JSON for table and charts.
+
+    `provincias` and `points` are the feature properties of each layer.
+    """
     stats = {
         "provincias": [],
         "departamentos": [],
@@ -454,40 +975,80 @@ def generate_stats(provincias: dict, departamentos: dict, points: dict) -> dict:
     }
     
     # Province stats (only those with data)
-    for f in provincias['features']:
-        props = f['properties'].copy()
-        del props['fid']  # Remove internal ID
+    for props in provincias:
         if props.get('porcentaje') is not None:
             stats['provincias'].append(props)
     
-    # Department stats from points (have all the data)
+    # Department stats from points (have all the data), counted in one pass
     dept_list = []
-    for f in points['features']:
-        props = f['properties'].copy()
-        del props['fid']
+    nivel_counts = Counter()
+    total_with_data = 0
+    for props in points:
         dept_list.append(props)
+        nivel_counts[props.get('nivel')] += 1
+        if props.get('porcentaje') is not None:
+            total_with_data += 1
     
     dept_list.sort(key=lambda x: x.get('porcentaje', 0) or 0, reverse=True)
     stats['departamentos'] = dept_list
     
     # Summary
-    total_with_data = len([d for d in dept_list if d.get('porcentaje') is not None])
-    alto = len([d for d in dept_list if d.get('nivel') == 'alto'])
-    sobre = len([d for d in dept_list if d.get('nivel') == 'sobre_promedio'])
-    normal = len([d for d in dept_list if d.get('nivel') == 'normal'])
-    
     stats['summary'] = {
         "total_departamentos": total_with_data,
-        "total_departamentos_ign": len(departamentos['features']),
-        "alto_nivel": alto,
-        "sobre_promedio": sobre,
-        "normal": normal,
+        "total_departamentos_ign": total_departamentos_ign,
+        "alto_nivel": nivel_counts[NIVEL_ALTO],
+        "sobre_promedio": nivel_counts[NIVEL_SOBRE_PROMEDIO],
+        "normal": nivel_counts[NIVEL_NORMAL],
         "total_provincias": len(stats['provincias'])
     }
     
     return stats
 
 
+def export_provincias(tierras_data: dict) -> tuple:
+    """Write provincias.geojson in a worker process.
+
+    Returns the feature count, the number matched with Tierras data and the
+    feature properties (for stats).
+    """
+    properties = []
+    counts = {}
+    with closing(connect_gpkg(IGN_PROVS)) as conn:
+        count = write_featurecollection(
+            OUTPUT_DIR / "provincias.geojson",
+            collect_properties(process_ign_provincias(conn, tierras_data, counts), properties)
+        )
+    return count, counts['matched'], properties
+
+
+def export_departamentos(tierras_data: dict, province_code_map: dict) -> tuple:
+    """Write departamentos.geojson in a worker process.
+
+    Returns the feature count and the number matched with Tierras data.
+    """
+    counts = {}
+    with closing(connect_gpkg(IGN_DEPTOS)) as conn:
+        count = write_featurecollection(
+            OUTPUT_DIR / "departamentos.geojson",
+            process_ign_departamentos(conn, tierras_data, province_code_map, counts)
+        )
+    return count, counts['matched']
+
+
+def export_points() -> tuple:
+    """Write puntos.geojson in a worker process.
+
+    Returns the feature count and the feature properties (for stats).
+    """
+    properties = []
+    with closing(connect_gpkg(TIERRAS_GPKG)) as conn:
+        count = write_featurecollection(
+            OUTPUT_DIR / "puntos.geojson",
+            collect_properties(process_tierras_points(conn), properties)
+        )
+    return count, properties
+
+
 def main():
     print("=" * 60)
     print("Tierras Extranjerizadas - Data Preparation v2")
@@ -500,64 +1061,52 @@ def main():
         print("⚠ Shapely not installed. Run: pip install shapely")
         return
     
-    # Connect to databases
-    tierras_conn = sqlite3.connect(TIERRAS_GPKG)
-    ign_deptos_conn = sqlite3.connect(IGN_DEPTOS)
-    ign_provs_conn = sqlite3.connect(IGN_PROVS)
-    
-    try:
-        # Load Tierras data (points with extranjerización info)
-        print("\nLoading Tierras data...")
+    # Load Tierras data (points with extranjerización info)
+    print("\nLoading Tierras data...")
+    with closing(connect_gpkg(TIERRAS_GPKG)) as tierras_conn:
         tierras_data = load_tierras_data(tierras_conn)
-        print(f"  Provincias: {len(tierras_data['provincias'])}")
-        print(f"  Departamentos: {len(tierras_data['departamentos'])}")
-        
-        # Process IGN polygons with Tierras data
-        print("\nProcessing polygons from IGN...")
+    print(f"  Provincias: {len(tierras_data['provincias'])}")
+    print(f"  Departamentos: {len(tierras_data['departamentos'])}")
+    
+    with closing(connect_gpkg(IGN_PROVS)) as ign_provs_conn:
         province_code_map = build_province_code_map(ign_provs_conn)
-        provincias = process_ign_provincias(ign_provs_conn, tierras_data)
-        departamentos = process_ign_departamentos(ign_deptos_conn, tierras_data, province_code_map)
-        
-        # Process original points from Tierras
-        print("\nProcessing points from Tierras...")
-        points = process_tierras_points(tierras_conn)
-        
-        # Generate stats
-        stats = generate_stats(provincias, departamentos, points)
-        
-        # Write outputs
-        print("\nWriting outputs...")
-        
-        with open(OUTPUT_DIR / "provincias.geojson", 'w', encoding='utf-8') as f:
-            json.dump(provincias, f, ensure_ascii=False)
-        print(f"  ✓ provincias.geojson ({len(provincias['features'])} features)")
-        
-        with open(OUTPUT_DIR / "departamentos.geojson", 'w', encoding='utf-8') as f:
-            json.dump(departamentos, f, ensure_ascii=False)
-        print(f"  ✓ departamentos.geojson ({len(departamentos['features'])} features)")
-        
-        with open(OUTPUT_DIR / "puntos.geojson", 'w', encoding='utf-8') as f:
-            json.dump(points, f, ensure_ascii=False)
-        print(f"  ✓ puntos.geojson ({len(points['features'])} features)")
-        
-        with open(OUTPUT_DIR / "stats.json", 'w', encoding='utf-8') as f:
-            json.dump(stats, f, ensure_ascii=False, indent=2)
-        print(f"  ✓ stats.json")
-        
-        print("\n" + "=" * 60)
-        print("Summary:")
-        print(f"  Provincias (polígonos): {len(provincias['features'])}")
-        print(f"  Departamentos (polígonos): {len(departamentos['features'])}")
-        print(f"  Puntos con datos: {len(points['features'])}")
-        print(f"    - Alto nivel (>10%): {stats['summary']['alto_nivel']}")
-        print(f"    - Sobre promedio (6-10%): {stats['summary']['sobre_promedio']}")
-        print(f"    - Normal (<6%): {stats['summary']['normal']}")
-        print("=" * 60)
-        
-    finally:
-        tierras_conn.close()
-        ign_deptos_conn.close()
-        ign_provs_conn.close()
+    
+    # Process IGN polygons and Tierras points in parallel, one layer per process.
+    # Workers are spawned rather than forked, so no sqlite3 handle or GEOS
+    # state is inherited from this process.
+    print("\nProcessing polygons from IGN and points from Tierras...")
+    with ProcessPoolExecutor(max_workers=3, mp_context=multiprocessing.get_context('spawn')) as executor:
+        provincias_future = executor.submit(export_provincias, tierras_data)
+        departamentos_future = executor.submit(export_departamentos, tierras_data, province_code_map)
+        points_future = executor.submit(export_points)
+        total_provincias, matched_provincias, provincias = provincias_future.result()
+        total_departamentos, matched_departamentos = departamentos_future.result()
+        total_points, points = points_future.result()
+
+    # Reported here rather than by the workers, whose output would interleave
+    print(f"  Found {total_provincias} provincias, matched {matched_provincias} with Tierras data")
+    print(f"  Found {total_departamentos} departamentos, matched {matched_departamentos} with Tierras data")
+    print(f"  Found {total_points} points")
+    
+    # Write outputs
+    print("\nWriting outputs...")
+    print(f"  ✓ provincias.geojson ({total_provincias} features)")
+    print(f"  ✓ departamentos.geojson ({total_departamentos} features)")
+    print(f"  ✓ puntos.geojson ({total_points} features)")
+    
+    stats = generate_stats(provincias, total_departamentos, points)
+    (OUTPUT_DIR / "stats.json").write_bytes(encode_json(stats, indent=True))
+    print(f"  ✓ stats.json")
+    
+    print("\n" + "=" * 60)
+    print("Summary:")
+    print(f"  Provincias (polígonos): {total_provincias}")
+    print(f"  Departamentos (polígonos): {total_departamentos}")
+    print(f"  Puntos con datos: {total_points}")
+    print(f"    - Alto nivel (>10%): {stats['summary']['alto_nivel']}")
+    print(f"    - Sobre promedio (6-10%): {stats['summary']['sobre_promedio']}")
+    print(f"    - Normal (<6%): {stats['summary']['normal']}")
+    print("=" * 60)
 
 
 if __name__ == "__main__":